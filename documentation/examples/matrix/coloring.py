@@ -20,56 +20,116 @@
 # 
 # 
 from casadi import *
+from casadi.tools import *
+from numpy import *
 
 #! Read all about coloring in the seminal paper "What color is your Jacobian?" http://www.cs.odu.edu/~pothen/Papers/sirev2005.pdf
-def color(A):
-  print "="*80
-  print "Original:"
-  print repr(IMatrix(A,1))
-  print "Colored: "
-  print repr(IMatrix(A.unidirectionalColoring(),1))
+#! reportColoring, from casadi.tools, prints a sparsity pattern and its coloring by CRSSparsity::unidirectionalColoring (or starColoring), and returns the number of colors.
 
 A = sp_diag(5)
-color(A)
+reportColoring(A)
 #! One direction needed to capture all
-color(sp_dense(5,10))
+reportColoring(sp_dense(5,10))
 #! We need 5 directions.
 #! The colored response reads: each row corresponds to a direction;
 #! each column correspond to a row of the original matrix.
 
-color(A+sp_triplet(5,5,[0],[4]))
+reportColoring(A+sp_triplet(5,5,[0],[4]))
 #! First 4 rows can be taken together, the fifth row is taken seperately
-color(A+sp_triplet(5,5,[4],[0]))
+reportColoring(A+sp_triplet(5,5,[4],[0]))
 #! First 4 rows can be taken together, the fifth row is taken seperately
 
-color(A+sp_triplet(5,5,[0]*5,range(5)))
+reportColoring(A+sp_triplet(5,5,[0]*5,list(range(5))))
 #! The first row is taken seperately.
 #! The remainding rows are lumped together in one direction.
 
-color(A+sp_triplet(5,5,range(5),[0]*5))
+reportColoring(A+sp_triplet(5,5,list(range(5)),[0]*5))
 #! We need 5 directions.
 
 #! Next, we look at starColoring
 
-def color(A):
-  print "="*80
-  print "Original:"
-  print repr(IMatrix(A,1))
-  print "Star colored: "
-  print repr(IMatrix(A.starColoring(1),1))
-  
-color(A)
+reportColoring(A,"star")
 #! One direction needed to capture all
 
-color(sp_dense(5,5))
+reportColoring(sp_dense(5,5),"star")
 #! We need 5 directions.
 
-color(A+sp_triplet(5,5,[0]*5,range(5))+sp_triplet(5,5,range(5),[0]*5))
+reportColoring(A+sp_triplet(5,5,[0]*5,list(range(5)))+sp_triplet(5,5,list(range(5)),[0]*5),"star")
 #! The first row/col is taken seperately.
 #! The remainding rows/cols are lumped together in one direction.
 
 #! Let's take an example from the paper
 
-A = IMatrix([[1,1,0,0,0,0],[1,1,1,0,1,1],[0,1,1,1,0,0],[0,0,1,1,0,1],[0,1,0,0,1,0],[0,1,0,1,0,1]])
-makeSparse(A)
-color(A.sparsity())
+B = IMatrix([[1,1,0,0,0,0],[1,1,1,0,1,1],[0,1,1,1,0,0],[0,0,1,1,0,1],[0,1,0,0,1,0],[0,1,0,1,0,1]])
+makeSparse(B)
+reportColoring(B.sparsity(),"star")
+
+#! The outcome of the greedy star coloring depends on the order in which the rows are visited.
+#! Ordering 0 colors the rows in their natural order, ordering 1 (the default) colors the rows with the most nonzeros first.
+
+#! A banded pattern with bandwidth p, built from its diagonals
+def banded(n,p):
+  B = sp_diag(n)
+  for k in range(1,p+1):
+    B = B + sp_band(n,k) + sp_band(n,-k)
+  return B
+
+for B in [sp_diag(5), banded(10,2), banded(20,2), sp_diag(5)+sp_triplet(5,5,[4]*5,list(range(5)))+sp_triplet(5,5,list(range(5)),[4]*5)]:
+  print("="*80)
+  print(repr(IMatrix(B,1)))
+  for ordering, name in [(0,"natural"),(1,"largest first")]:
+    print("Star coloring with %s ordering: %d colors" % (name,reportColoring(B,"star",ordering,verbose=False)))
+#! For the banded patterns, 5 colors are needed with either ordering, both for size 10 and size 20:
+#! the number of colors depends on the bandwidth, not on the size of the matrix.
+#! For the arrowhead pattern, the largest first ordering colors the dense last row/col first and needs only 2 colors:
+#! the remainding rows/cols are lumped together. With the natural ordering, 5 colors are needed.
+
+#! Coloring the rows of A, as above, gives seeds for adjoint mode. Coloring the rows of the transpose gives seeds for forward mode.
+#! CasADi's Jacobian construction tries both and keeps the one that needs the least directions.
+
+reportColoring(A+sp_triplet(5,5,list(range(5)),[0]*5),"uni_trans")
+#! Coloring the rows needs 5 directions, as we saw before. The columns however can be covered by only 2 directions.
+
+reportColoring(sp_dense(5,10),"uni_trans")
+#! A dense 5-by-10 matrix needs 5 adjoint directions, and 10 forward directions.
+
+#! Coloring in action
+#! ==================
+#! The number of colors is the number of directional derivatives needed to calculate a Jacobian.
+#! Let's look at a function with a banded Jacobian.
+
+x = ssym("x",20)
+f = SXFunction([x],[x[:-2]-2*x[1:-1]+x[2:]])
+f.init()
+
+J = f.jacSparsity()
+reportColoring(J)
+reportColoring(J,"uni_trans")
+#! Only 3 directions are needed instead of 18 or 20: the number of colors does not grow with the size of x
+
+#! Each color of the columns is one forward direction: the seed is one for all columns of that color.
+#! Since the columns of a color do not share any row, every nonzero of the Jacobian can be read off from exactly one forward sensitivity.
+D = J.transpose().unidirectionalColoring()
+seeds = array(IMatrix(D,1))
+ndir = D.size1()
+
+f.setOption("number_of_fwd_dir",ndir)
+f.init()
+f.setInput(list(range(20)))
+for d in range(ndir):
+  f.fwdSeed(0,d).set(seeds[d])
+f.evaluate(ndir,0)
+
+#! Reconstruct the Jacobian from the ndir forward sensitivities
+pattern = array(IMatrix(J,1))
+Jc = zeros(pattern.shape)
+for d in range(ndir):
+  Jc += pattern * outer(array(f.fwdSens(0,d)).ravel(),seeds[d])
+
+#! The result agrees with the symbolic Jacobian, using 3 forward directions instead of 20
+Jref = SXFunction([x],[jacobian(f.outputExpr(0),x)])
+Jref.init()
+Jref.setInput(list(range(20)))
+Jref.evaluate()
+assert(ndir==3)
+assert(all(Jc==array(Jref.output())))
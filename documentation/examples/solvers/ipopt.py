@@ -58,11 +58,22 @@ assert(abs(solver.output()[0]-1)<1e-9)
 n = 5
 
 x=ssym("x",n)
+#! The linear constraints are written as a product with a sparse selector matrix
+#! rather than by concatenating scalar expressions, which scales to large n
+A = DMatrix(sp_triplet(2,n,[0,0,1],[1,2,0]),1)
 #! Note how we do not distinguish between equalities and inequalities here
-f=SXFunction([x],[mul((x-1).T,x-1)])
-g=SXFunction([x],[vertcat([x[1]+x[2],x[0]])])
+f=SXFunction([x],[sumAll((x-1)**2)])
+g=SXFunction([x],[mul(A,x)])
+g.init()
+
+#! Ipopt is passed the Jacobian of the constraints in sparse format.
+#! It has only 3 structural nonzeros, while a dense 2-by-5 Jacobian would have 10:
+print g.jacSparsity()
+assert(g.jacSparsity().size()==3)
 
 solver = IpoptSolver(f,g)
+#! f and g are combined into a single Lagrangian expression, from which an exact Hessian is generated
+solver.setOption("generate_hessian",True)
 solver.init()
 solver.input(NLP_LBX).set([-10]*n)
 solver.input(NLP_UBX).set([10]*n)
@@ -73,8 +84,8 @@ solver.solve()
 
 #! The solution is obviously [2,0.5,0.5,1,1]:
 print solver.output()
-for (i,e) in zip(range(n),[2,0.5,0.5,1,1]):
-  assert(abs(solver.output()[i]-e)<1e-7)
+sol = array(solver.output()).ravel()
+assert(all(abs(sol-array([2,0.5,0.5,1,1]))<1e-7))
 
 
 #! Problem with parameters
@@ -109,3 +120,10 @@ solver.solve()
 print solver.output()
 assert(abs(solver.output()[0]-2*a_)<1e-9)
 
+#! The solver is only initialized once, so it can be reused for any number of parameter values:
+solver.input(NLP_P).set([3*a_])
+solver.solve()
+
+#! The solution is obviously 3*a:
+print solver.output()
+assert(abs(solver.output()[0]-3*a_)<1e-9)
@@ -22,14 +22,19 @@
 # -*- coding: utf-8 -*-
 from casadi import *
 
+# Just-in-time compile the NLP functions (requires CasADi compiled with WITH_LLVM=ON)
+jit = False
+
 # Declare variables
 x = ssym("x",2)
 
 # Form the NLP objective
-f = SXFunction([x],[x[0]**2 + x[1]**2])
+f = SXFunction([x],[inner_prod(x,x)])
+f.setOption("just_in_time",jit)
 
 # Form the NLP constraints
-g = SXFunction([x],[x[0]+x[1]-10])
+g = SXFunction([x],[sumAll(x)-10])
+g.setOption("just_in_time",jit)
 
 # Pick an NLP solver
 #MySolver = IpoptSolver
@@ -1,6 +1,6 @@
 from casadi import *
 from numpy import *
-from os import system
+from subprocess import check_call
 import time
 import sys
 
@@ -15,8 +15,17 @@ c = mul(z,b)
 c = 2 + c
 f = MXFunction([a,b],[c])
 f.init()
-f.generateCode("f_mx.c")
-system("gcc -fPIC -shared f_mx.c  -o f_mx.so")
+
+# Generate code for the function expanded in scalar operations.
+# Note that the size of the expansion is not bounded by the number of MX operations:
+# a single mul of dense n-by-n matrices expands to O(n^3) scalar operations.
+# For large matrix operations, generate code from the MXFunction f instead.
+f_gen = f.expand()
+f_gen.init()
+f_gen.generateCode("f_mx.c")
+
+# Compile into a shared library, piping between the compilation stages rather than using temporary files
+check_call(["gcc","-O3","-march=native","-pipe","-fPIC","-shared","f_mx.c","-o","f_mx.so"])
 
 ef = ExternalFunction("./f_mx.so")
 ef.init()
@@ -34,5 +43,5 @@ ef.setInput(a_val,0);
 ef.setInput(b_val,1);
 ef.evaluate()
 
-print f.output()
+print ef.output()
 
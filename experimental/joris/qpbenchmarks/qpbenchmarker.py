@@ -22,6 +22,7 @@
 from numpy import *
 from casadi import *
 from casadi.tools import *
+import os
 
 class OnlineQPBenchMark:
   def __init__(self,name):
@@ -29,24 +30,41 @@ class OnlineQPBenchMark:
     
     self.nQP,self.nV,self.nC,self.nEC = self.readmatrix('dims.oqp')
 
-    self.H  = DMatrix(self.readmatrix('H.oqp'))
-    self.g  = DMatrix(self.readmatrix('g.oqp'))
-    self.lb = DMatrix(self.readmatrix('lb.oqp'))
-    self.ub = DMatrix(self.readmatrix('ub.oqp'))
+    # The text files store H and A densely: keep a copy without the structural zeros for the sparse solvers
+    self.H  = self.readDMatrix('H.oqp')
+    self.H_sparse = DMatrix(self.H)
+    makeSparse(self.H_sparse)
+    self.g  = self.readDMatrix('g.oqp')
+    self.lb = self.readDMatrix('lb.oqp')
+    self.ub = self.readDMatrix('ub.oqp')
 
     if self.nC > 0:
-        self.A   = DMatrix(self.readmatrix('A.oqp'))
-        self.lbA = DMatrix(self.readmatrix('lbA.oqp'))
-        self.ubA = DMatrix(self.readmatrix('ubA.oqp'))
+        self.A   = self.readDMatrix('A.oqp')
+        self.A_sparse = DMatrix(self.A)
+        makeSparse(self.A_sparse)
+        self.lbA = self.readDMatrix('lbA.oqp')
+        self.ubA = self.readDMatrix('ubA.oqp')
 
-    self.x_opt   = DMatrix(self.readmatrix('x_opt.oqp'))
+    self.x_opt   = self.readDMatrix('x_opt.oqp')
     self.y_opt   = self.readmatrix('y_opt.oqp')
     self.obj_opt = self.readmatrix('obj_opt.oqp')
 
   def readmatrix(self,name):
-    return loadtxt(self.name + '/'+name)
+    # Parse the text file only once and keep a binary copy next to it
+    path  = self.name + '/'+name
+    cache = path + '.npy'
+    if not os.path.exists(cache) or os.path.getmtime(cache) < os.path.getmtime(path):
+      save(cache,loadtxt(path))
+    return load(cache,mmap_mode='r')
+
+  def readDMatrix(self,name):
+    # DMatrix needs a contiguous buffer, not the memory-mapped array itself
+    return DMatrix(ascontiguousarray(self.readmatrix(name)))
 
 qp = OnlineQPBenchMark('diesel')
+print "H: ", qp.H_sparse.size(), " nonzeros out of ", qp.H.numel()
+if qp.nC > 0:
+  print "A: ", qp.A_sparse.size(), " nonzeros out of ", qp.A.numel()
 
 qpsolvers = []
 try:
@@ -62,27 +80,53 @@ try:
 except:
   pass
 
+# Convert the data that changes from one QP to the next only once, each row being one QP.
+# The arrays are stored row-major, so every row is a contiguous vector that can be passed without slicing or transposing a DMatrix
+lbA = array(qp.lbA)
+ubA = array(qp.ubA)
+lb  = array(qp.lb)
+ub  = array(qp.ub)
+g   = array(qp.g)
+
+nsolve = qp.g.shape[1]
+x_opt   = array(qp.x_opt)[:nsolve]
+obj_opt = array(qp.obj_opt)[:nsolve]
+
 for qpsolver in qpsolvers:
   print qpsolver
 
-  solver = qpsolver(qp.H.sparsity(),qp.A.sparsity())
+  # qpOASES works with dense matrices: passing it sparse H and A would make it copy both to dense storage before every QP
+  if qpsolver.__name__=="QPOasesSolver":
+    H, A = qp.H, qp.A
+  else:
+    H, A = qp.H_sparse, qp.A_sparse
+
+  solver = qpsolver(H.sparsity(),A.sparsity())
+  if solver.hasOption("printLevel"):
+    solver.setOption("printLevel","none")
   solver.init()
-  solver.setInput(qp.H,QP_H)
-  solver.setInput(qp.A,QP_A)
-  for i in range(qp.g.shape[1]):
-    solver.setInput(qp.lbA[i,:].T,QP_LBA)
-    solver.setInput(qp.ubA[i,:].T,QP_UBA)
-    solver.setInput(qp.lb[i,:].T,QP_LBX)
-    solver.setInput(qp.ub[i,:].T,QP_UBX)
-    solver.setInput(qp.g[i,:].T,QP_G)
+  # H and A are the same for all QPs, so they are only passed once.
+  # (qpOASES hotstarts from the previous active set on every solve after the first, whether or not they are set again)
+  solver.setInput(H,QP_H)
+  solver.setInput(A,QP_A)
+  
+  # Solutions of all QPs, compared to the reference at once
+  x   = zeros(x_opt.shape)
+  obj = zeros(obj_opt.shape)
+  
+  for i in range(nsolve):
+    solver.setInput(lbA[i],QP_LBA)
+    solver.setInput(ubA[i],QP_UBA)
+    solver.setInput(lb[i],QP_LBX)
+    solver.setInput(ub[i],QP_UBX)
+    solver.setInput(g[i],QP_G)
 
     solver.solve()
 
-    print solver.output(QP_PRIMAL)
-    print qp.x_opt[i,:].T
-    print qp.y_opt[i,:].T
-    print qp.obj_opt[i]
-    print solver.output(QP_COST)
-    print fabs(solver.output(QP_PRIMAL)-qp.x_opt[i,:].T)
-    assert(all(fabs(solver.output(QP_PRIMAL)-qp.x_opt[i,:].T)<1e-4))
-    assert(fabs(qp.obj_opt[i]-solver.output(QP_COST))<1e-5)
+    x[i]   = array(solver.output(QP_PRIMAL)).ravel()
+    obj[i] = solver.output(QP_COST)[0]
+
+  print fabs(x-x_opt)
+  print fabs(obj-obj_opt)
+  assert(all(fabs(x-x_opt)<1e-4))
+  assert(all(fabs(obj-obj_opt)<1e-5))
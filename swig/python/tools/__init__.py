@@ -25,3 +25,4 @@ from graph import *
 from variables import *
 from collection import Collection 
 from bounds import *
+from coloring import *
@@ -0,0 +1,49 @@
+#
+#     This file is part of CasADi.
+# 
+#     CasADi -- A symbolic framework for dynamic optimization.
+#     Copyright (C) 2010 by Joel Andersson, Moritz Diehl, K.U.Leuven. All rights reserved.
+# 
+#     CasADi is free software; you can redistribute it and/or
+#     modify it under the terms of the GNU Lesser General Public
+#     License as published by the Free Software Foundation; either
+#     version 3 of the License, or (at your option) any later version.
+# 
+#     CasADi is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#     Lesser General Public License for more details.
+# 
+#     You should have received a copy of the GNU Lesser General Public
+#     License along with CasADi; if not, write to the Free Software
+#     Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+# 
+# 
+from casadi import *
+
+def getColoring(A,method="uni",ordering=1):
+  """ Color the sparsity pattern A, returning a pattern with one row per color
+  
+    method: "uni"       unidirectional coloring of the rows (adjoint mode seeds)
+            "uni_trans" unidirectional coloring of the columns (forward mode seeds)
+            "star"      star coloring of a symmetric pattern, ordering being natural (0) or largest first (1)
+  """
+  if method=="uni":
+    return A.unidirectionalColoring()
+  elif method=="uni_trans":
+    return A.transpose().unidirectionalColoring()
+  elif method=="star":
+    return A.starColoring(ordering)
+  else:
+    raise Exception("Unknown coloring method \"%s\". Possible values are \"uni\", \"uni_trans\" and \"star\"." % method)
+
+def reportColoring(A,method="uni",ordering=1,verbose=True):
+  """ Print the sparsity pattern A and its coloring, returning the number of colors """
+  D = getColoring(A,method,ordering)
+  if verbose:
+    print "="*80
+    print "Original:"
+    print repr(IMatrix(A,1))
+    print "Colored (%s): %d colors" % (method,D.size1())
+    print repr(IMatrix(D,1))
+  return D.size1()